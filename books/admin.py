@@ -1,10 +1,130 @@
-from django.contrib import admin
-from .models import Book
+import re
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.db.models import Q
+
+from .models import Book, Category, Supplier
+from .pagination import EstimatedCountPaginator
+from .services import InventoryService, RepricingService
+
+
+ISBN_SEARCH_PATTERN = re.compile(r'[\dXx-]{10,17}')
+
+
+class BookActionForm(ActionForm):
+    stock_delta = forms.IntegerField(
+        required=False,
+        label='Variación de stock',
+        help_text='Para la acción "Ajustar stock" (puede ser negativa)',
+    )
+
+
+class CategoryListFilter(admin.SimpleListFilter):
+    """Opciones tomadas de la tabla de categorías, con su contador mantenido."""
+
+    title = 'categoría'
+    parameter_name = 'category'
+
+    def lookups(self, request, model_admin):
+        return [
+            (category_id, f'{name} ({book_count})')
+            for category_id, name, book_count in Category.objects.values_list('id', 'name', 'book_count')
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(category_id=self.value())
+        return queryset
+
+
+class CurrencyListFilter(admin.SimpleListFilter):
+    """Opciones tomadas de la tabla de proveedores; filtra por los ids de proveedor."""
+
+    title = 'moneda'
+    parameter_name = 'currency'
+
+    def lookups(self, request, model_admin):
+        currencies = Supplier.objects.order_by('currency').values_list('currency', flat=True).distinct()
+        return [(currency, currency) for currency in currencies]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            supplier_ids = Supplier.objects.filter(currency=self.value()).values_list('id', flat=True)
+            return queryset.filter(supplier_id__in=list(supplier_ids))
+        return queryset
 
 
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'isbn', 'cost_usd', 'stock_quantity', 'category']
-    list_filter = ['category', 'supplier_country']
-    search_fields = ['title', 'author', 'isbn']
-    readonly_fields = ['created_at', 'updated_at']
\ No newline at end of file
+    list_filter = [CategoryListFilter, 'supplier', CurrencyListFilter]
+    list_select_related = ['category', 'supplier']
+    search_fields = ['^title', '^author', '=isbn']
+    search_help_text = 'ISBN exacto, o inicio del título o del autor.'
+    readonly_fields = ['created_at', 'updated_at']
+    # Orden por clave primaria (indexada) y sin conteos completos de la tabla
+    ordering = ['-id']
+    sortable_by = ['isbn']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    action_form = BookActionForm
+    actions = ['reprice', 'adjust_stock']
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        if getattr(changelist.paginator, 'is_estimated', False):
+            self.message_user(
+                request,
+                'El total de libros es aproximado (estimación de PostgreSQL); '
+                'con filtros o búsqueda se muestra el total exacto.',
+                messages.INFO,
+            )
+        return changelist
+
+    def get_search_results(self, request, queryset, search_term):
+        """Búsqueda que aprovecha índices: ISBN exacto o prefijo de título/autor."""
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if ISBN_SEARCH_PATTERN.fullmatch(term):
+            return queryset.filter(isbn=term), False
+        return queryset.filter(Q(title__istartswith=term) | Q(author__istartswith=term)), False
+
+    @admin.action(description='Recalcular precio de venta con las tasas actuales')
+    def reprice(self, request, queryset):
+        updated, is_live_rate = RepricingService.reprice_books(queryset)
+        self.message_user(request, f'{updated} libros repreciados.', messages.SUCCESS)
+        if not is_live_rate:
+            self.message_user(
+                request,
+                'Se utilizaron tasas de cambio por defecto debido a error en API externa.',
+                messages.WARNING,
+            )
+
+    @admin.action(description='Ajustar stock')
+    def adjust_stock(self, request, queryset):
+        try:
+            delta = int(request.POST.get('stock_delta') or 0)
+        except ValueError:
+            delta = 0
+        if not delta:
+            self.message_user(request, 'Indicar una variación de stock distinta de 0.', messages.ERROR)
+            return
+
+        updated = InventoryService.adjust_stock(queryset, delta)
+        self.message_user(request, f'Stock ajustado en {delta:+d} para {updated} libros.', messages.SUCCESS)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ['name', 'book_count', 'stock_total']
+    search_fields = ['name']
+    readonly_fields = ['book_count', 'stock_total']
+
+
+@admin.register(Supplier)
+class SupplierAdmin(admin.ModelAdmin):
+    list_display = ['country_code', 'currency']
+    search_fields = ['country_code']
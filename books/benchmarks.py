@@ -0,0 +1,361 @@
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.conf import settings
+from django.db import connections
+from django.db.models import Max, Min
+from django.test import Client
+from django.utils import timezone
+
+from .models import Book, Category
+from .serializers import BookSerializer
+from .services import ExchangeRateService
+
+
+class ExchangeRateStubServer:
+    """
+    Servidor HTTP local que imita la API de tasas de cambio, con latencia y
+    tasa de fallos configurables, para pruebas de carga sin depender del upstream.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, failure_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.requests_served = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v4/latest/USD"
+
+    def _handle(self, request):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        with self._lock:
+            self.requests_served += 1
+            failed = self._rng.random() < self.failure_rate
+
+        if failed:
+            status, payload = 503, {'error': 'Servicio no disponible (stub)'}
+        else:
+            rates = {currency: float(rate) for currency, rate in ExchangeRateService.DEFAULT_RATES.items()}
+            status, payload = 200, {'base': 'USD', 'rates': {'USD': 1.0, **rates}}
+
+        body = json.dumps(payload).encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self):
+        """Atiende peticiones en un hilo en segundo plano."""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class ApiBenchmark:
+    """
+    Ejecuta cada escenario de la API contra el dataset cargado y mide
+    throughput y latencias (p50/p95/p99).
+
+    Sin `base_url` las peticiones se hacen en proceso con el cliente de pruebas
+    de Django; con `base_url` se hacen por HTTP contra un servidor en ejecución
+    que debe usar la misma base de datos.
+    """
+
+    SCENARIOS = [
+        'list_first_page',
+        'list_middle_page',
+        'list_last_page',
+        'search',
+        'search_by_category',
+        'search_by_category_id',
+        'low_stock',
+        'facets',
+        'retrieve',
+        'batch_get',
+        'create',
+        'update',
+        'calculate_price',
+    ]
+
+    SAMPLE_SIZE = 1000
+    BATCH_GET_SIZE = 100
+    # Prefijo de ISBN reservado para los libros creados por el benchmark
+    CREATE_ISBN_PREFIX = '977'
+
+    def __init__(self, base_url=None, concurrency=4, requests_per_scenario=200, warmup=10, seed=42):
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.concurrency = concurrency
+        self.requests_per_scenario = requests_per_scenario
+        self.warmup = warmup
+        self.rng = random.Random(seed)
+        self._local = threading.local()
+        self._created_isbns = []
+
+    def run(self, scenarios=None) -> dict:
+        """Ejecuta los escenarios indicados (todos por defecto) y retorna los resultados."""
+        scenarios = scenarios or self.SCENARIOS
+        unknown = set(scenarios) - set(self.SCENARIOS)
+        if unknown:
+            raise ValueError(f"Escenarios desconocidos: {', '.join(sorted(unknown))}")
+
+        self._load_dataset()
+        results = {}
+        try:
+            for name in scenarios:
+                build_request = getattr(self, f'_request_{name}')
+                warmup = [build_request() for _ in range(self.warmup)]
+                measured = [build_request() for _ in range(self.requests_per_scenario)]
+                self._execute(warmup)
+                results[name] = self._summarize(*self._execute(measured))
+        finally:
+            self._cleanup()
+
+        return {
+            'timestamp': timezone.now().isoformat(),
+            'config': {
+                'base_url': self.base_url,
+                'concurrency': self.concurrency,
+                'requests_per_scenario': self.requests_per_scenario,
+                'warmup': self.warmup,
+            },
+            'dataset': {'books': self.book_count, 'categories': len(self.category_names)},
+            'scenarios': results,
+        }
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+        """
+        Compara con una ejecución de referencia y retorna las regresiones:
+        p95 mayor o throughput menor que la referencia en más de `threshold`.
+        Un escenario con errores nunca se considera aprobado, aunque no esté en
+        la referencia: sus tiempos no son comparables.
+        """
+        regressions = []
+        for name, current in results['scenarios'].items():
+            reference = baseline.get('scenarios', {}).get(name)
+
+            if current['errors']:
+                current_rate = current['errors'] / current['requests']
+                detail = ''
+                if reference is not None:
+                    reference_rate = reference['errors'] / reference['requests']
+                    detail = f" vs {reference_rate:.1%} de referencia"
+                regressions.append(
+                    f"{name}: {current['errors']} errores ({current_rate:.1%}){detail}"
+                )
+
+            if reference is None:
+                continue
+
+            current_p95 = current['latency_ms']['p95']
+            reference_p95 = reference['latency_ms']['p95']
+            if current_p95 > reference_p95 * (1 + threshold):
+                regressions.append(
+                    f"{name}: p95 {current_p95:.1f}ms vs {reference_p95:.1f}ms de referencia"
+                )
+
+            current_rps = current['throughput_rps']
+            reference_rps = reference['throughput_rps']
+            if current_rps < reference_rps * (1 - threshold):
+                regressions.append(
+                    f"{name}: throughput {current_rps:.1f} req/s vs {reference_rps:.1f} req/s de referencia"
+                )
+        return regressions
+
+    def _load_dataset(self):
+        """Toma una muestra de ids, ISBN y categorías existentes para construir las peticiones."""
+        self.book_count = Book.objects.count()
+        if not self.book_count:
+            raise ValueError("No hay libros cargados; ejecutar generate_books o seed_books primero.")
+
+        bounds = Book.objects.aggregate(low=Min('id'), high=Max('id'))
+        candidates = {
+            self.rng.randint(bounds['low'], bounds['high'])
+            for _ in range(self.SAMPLE_SIZE * 2)
+        }
+        sample = list(
+            Book.objects.select_related('category', 'supplier')
+            .filter(id__in=candidates)
+            .order_by('id')[:self.SAMPLE_SIZE]
+        )
+        if not sample:
+            sample = list(Book.objects.select_related('category', 'supplier').order_by('id')[:self.SAMPLE_SIZE])
+
+        self.book_ids = [book.id for book in sample]
+        self.isbns = [book.isbn for book in sample]
+        self.update_payloads = {
+            book.id: {
+                key: value for key, value in BookSerializer(book).data.items()
+                if key not in BookSerializer.Meta.read_only_fields
+            }
+            for book in sample[:50]
+        }
+
+        categories = list(Category.objects.filter(book_count__gt=0).values_list('id', 'name'))
+        self.category_ids = [category_id for category_id, _ in categories] or [0]
+        self.category_names = [name for _, name in categories] or ['Literatura']
+        self.search_terms = sorted({word for name in self.category_names for word in name.split() if len(word) > 3})
+
+        self.last_page = max(1, math.ceil(self.book_count / settings.REST_FRAMEWORK['PAGE_SIZE']))
+        self.run_token = self.rng.randrange(10 ** 4)
+        self.create_counter = 0
+
+    # Constructores de peticiones: retornan (método, ruta, cuerpo)
+
+    def _request_list_first_page(self):
+        return 'GET', '/api/books/', None
+
+    def _request_list_middle_page(self):
+        return 'GET', f'/api/books/?page={max(1, self.last_page // 2)}', None
+
+    def _request_list_last_page(self):
+        return 'GET', f'/api/books/?page={self.last_page}', None
+
+    def _request_search(self):
+        return 'GET', f'/api/books/?search={self.rng.choice(self.search_terms or ["a"])}', None
+
+    def _request_search_by_category(self):
+        return 'GET', f'/api/books/search/?category={self.rng.choice(self.category_names)}', None
+
+    def _request_search_by_category_id(self):
+        return 'GET', f'/api/books/search/?category_id={self.rng.choice(self.category_ids)}', None
+
+    def _request_low_stock(self):
+        return 'GET', f'/api/books/low-stock/?threshold={self.rng.choice([0, 5, 10])}', None
+
+    def _request_facets(self):
+        return 'GET', f'/api/books/facets/?category_id={self.rng.choice(self.category_ids)}', None
+
+    def _request_retrieve(self):
+        return 'GET', f'/api/books/{self.rng.choice(self.book_ids)}/', None
+
+    def _request_batch_get(self):
+        size = min(self.BATCH_GET_SIZE, len(self.book_ids))
+        return 'POST', '/api/books/batch-get/', {'ids': self.rng.sample(self.book_ids, size)}
+
+    def _request_create(self):
+        self.create_counter += 1
+        isbn = f'{self.CREATE_ISBN_PREFIX}{self.run_token:04d}{self.create_counter:06d}'
+        self._created_isbns.append(isbn)
+        return 'POST', '/api/books/', {
+            'title': f'Libro de benchmark {self.create_counter}',
+            'author': 'Benchmark',
+            'isbn': isbn,
+            'cost_usd': '12.50',
+            'stock_quantity': self.rng.randint(0, 100),
+            'category': self.rng.choice(self.category_names),
+            'supplier_country': self.rng.choice(list(ExchangeRateService.COUNTRY_TO_CURRENCY)),
+        }
+
+    def _request_update(self):
+        book_id = self.rng.choice(list(self.update_payloads))
+        return 'PUT', f'/api/books/{book_id}/', self.update_payloads[book_id]
+
+    def _request_calculate_price(self):
+        return 'POST', f'/api/books/{self.rng.choice(self.book_ids)}/calculate-price/', None
+
+    def _execute(self, planned):
+        """Reparte las peticiones entre los hilos y retorna (latencias, errores, duración)."""
+        chunks = [planned[index::self.concurrency] for index in range(self.concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            outcomes = list(executor.map(self._execute_chunk, chunks))
+        duration = time.perf_counter() - started
+
+        latencies = [latency for chunk_latencies, _ in outcomes for latency in chunk_latencies]
+        errors = sum(chunk_errors for _, chunk_errors in outcomes)
+        return latencies, errors, duration
+
+    def _execute_chunk(self, chunk):
+        latencies = []
+        errors = 0
+        try:
+            for method, path, payload in chunk:
+                started = time.perf_counter()
+                status_code = self._send(method, path, payload)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status_code >= 400:
+                    errors += 1
+        finally:
+            if self.base_url is None:
+                connections.close_all()
+        return latencies, errors
+
+    def _send(self, method, path, payload) -> int:
+        if self.base_url is not None:
+            session = getattr(self._local, 'session', None)
+            if session is None:
+                session = self._local.session = requests.Session()
+            response = session.request(method, f'{self.base_url}{path}', json=payload, timeout=30)
+            return response.status_code
+
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(HTTP_HOST=self._allowed_host())
+        body = json.dumps(payload) if payload is not None else ''
+        response = client.generic(method, path, body, content_type='application/json')
+        return response.status_code
+
+    @staticmethod
+    def _allowed_host() -> str:
+        hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host]
+        return hosts[0].lstrip('.') if hosts else 'localhost'
+
+    @staticmethod
+    def _summarize(latencies, errors, duration) -> dict:
+        ordered = sorted(latencies)
+
+        def percentile(pct):
+            return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+        return {
+            'requests': len(ordered),
+            'errors': errors,
+            'duration_s': round(duration, 3),
+            'throughput_rps': round(len(ordered) / duration, 2) if duration else 0,
+            'latency_ms': {
+                'mean': round(sum(ordered) / len(ordered), 2),
+                'p50': round(percentile(50), 2),
+                'p95': round(percentile(95), 2),
+                'p99': round(percentile(99), 2),
+                'max': round(ordered[-1], 2),
+            },
+        }
+
+    def _cleanup(self):
+        """Elimina los libros creados por el escenario de creación."""
+        for start in range(0, len(self._created_isbns), 1000):
+            Book.objects.filter(isbn__in=self._created_isbns[start:start + 1000]).delete()
+        self._created_isbns = []
@@ -0,0 +1,22 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class CategoryFilter(BaseFilterBackend):
+    """
+    Filtra por ?category_id={id} (o varios ids separados por coma)
+    usando la FK de categoría en lugar de comparar texto.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        category_id = request.query_params.get('category_id')
+        if not category_id:
+            return queryset
+        
+        try:
+            category_ids = [int(value) for value in category_id.split(',')]
+        except ValueError:
+            raise ValidationError(
+                {"error": "El parámetro 'category_id' debe ser un número entero o una lista separada por comas."}
+            )
+        return queryset.filter(category_id__in=category_ids)
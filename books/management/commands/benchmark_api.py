@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from books.benchmarks import ApiBenchmark, ExchangeRateStubServer
+from books.services import ExchangeRateService
+
+
+class Command(BaseCommand):
+    help = 'Medir throughput y latencias (p50/p95/p99) de cada endpoint de la API'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url',
+            default=None,
+            help='URL de un servidor en ejecución (ej: http://localhost:8000); por defecto en proceso',
+        )
+        parser.add_argument('--requests', type=int, default=200, help='Peticiones medidas por escenario')
+        parser.add_argument('--warmup', type=int, default=10, help='Peticiones de calentamiento por escenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Hilos concurrentes')
+        parser.add_argument(
+            '--scenarios',
+            default=None,
+            help=f"Escenarios separados por coma ({', '.join(ApiBenchmark.SCENARIOS)})",
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Semilla para elegir libros y parámetros')
+        parser.add_argument(
+            '--stub-latency-ms',
+            type=int,
+            default=50,
+            help='Latencia del stub de tasas de cambio (solo en proceso)',
+        )
+        parser.add_argument(
+            '--stub-failure-rate',
+            type=float,
+            default=0.0,
+            help='Proporción de fallos del stub de tasas de cambio (solo en proceso)',
+        )
+        parser.add_argument(
+            '--output',
+            default='benchmark_results.json',
+            help='Archivo JSON donde guardar los resultados',
+        )
+        parser.add_argument('--baseline', default=None, help='Resultados de referencia para comparar')
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.10,
+            help='Degradación tolerada respecto a la referencia (0.10 = 10%%)',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = options['scenarios'].split(',') if options['scenarios'] else None
+        benchmark = ApiBenchmark(
+            base_url=options['base_url'],
+            concurrency=options['concurrency'],
+            requests_per_scenario=options['requests'],
+            warmup=options['warmup'],
+            seed=options['seed'],
+        )
+
+        # En proceso, las tasas de cambio se sirven desde un stub local
+        stub = None
+        original_api_url = ExchangeRateService.API_URL
+        if options['base_url'] is None:
+            stub = ExchangeRateStubServer(
+                latency_ms=options['stub_latency_ms'],
+                failure_rate=options['stub_failure_rate'],
+                seed=options['seed'],
+            )
+            stub.start()
+            ExchangeRateService.API_URL = stub.url
+
+        try:
+            results = benchmark.run(scenarios)
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            if stub is not None:
+                ExchangeRateService.API_URL = original_api_url
+                stub.stop()
+
+        if stub is not None:
+            results['config']['stub'] = {
+                'latency_ms': options['stub_latency_ms'],
+                'failure_rate': options['stub_failure_rate'],
+            }
+
+        self._print_results(results)
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2))
+        self.stdout.write(f'Resultados guardados en {output}')
+
+        if options['baseline']:
+            self._compare(results, Path(options['baseline']), options['threshold'])
+
+    def _print_results(self, results):
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'Escenario':<24}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>10}"
+        )
+        for name, result in results['scenarios'].items():
+            latency = result['latency_ms']
+            self.stdout.write(
+                f"{name:<24}{result['throughput_rps']:>10.1f}{latency['p50']:>10.1f}"
+                f"{latency['p95']:>10.1f}{latency['p99']:>10.1f}{result['errors']:>10}"
+            )
+        self.stdout.write('')
+
+    def _compare(self, results, baseline_path, threshold):
+        if not baseline_path.exists():
+            raise CommandError(f'No existe el archivo de referencia {baseline_path}.')
+
+        baseline = json.loads(baseline_path.read_text())
+        regressions = ApiBenchmark.compare(results, baseline, threshold)
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'✗ {regression}'))
+            raise CommandError(
+                f'{len(regressions)} regresiones respecto a {baseline_path} (umbral {threshold:.0%}).'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Sin regresiones respecto a {baseline_path} (umbral {threshold:.0%})')
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from books.benchmarks import ExchangeRateStubServer
+
+
+class Command(BaseCommand):
+    help = 'Servidor local que imita la API de tasas de cambio, con latencia y fallos configurables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1', help='Dirección de escucha')
+        parser.add_argument('--port', type=int, default=8001, help='Puerto de escucha')
+        parser.add_argument('--latency-ms', type=int, default=50, help='Latencia añadida a cada respuesta')
+        parser.add_argument(
+            '--failure-rate',
+            type=float,
+            default=0.0,
+            help='Proporción de respuestas con error 503 (0.0 a 1.0)',
+        )
+        parser.add_argument('--seed', type=int, default=None, help='Semilla para los fallos simulados')
+
+    def handle(self, *args, **options):
+        stub = ExchangeRateStubServer(
+            host=options['host'],
+            port=options['port'],
+            latency_ms=options['latency_ms'],
+            failure_rate=options['failure_rate'],
+            seed=options['seed'],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stub de tasas de cambio en {stub.url} "
+                f"(latencia {options['latency_ms']}ms, fallos {options['failure_rate']:.0%})"
+            )
+        )
+        self.stdout.write(f'Usar EXCHANGE_RATE_API_URL={stub.url} en el servidor de la API.')
+        try:
+            stub.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stub.server.server_close()
@@ -0,0 +1,310 @@
+import io
+import itertools
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection, connections, transaction
+
+from books.models import Book, Category
+from books.services import CatalogService, ExchangeRateService
+
+
+# Categorías en orden de popularidad; se reparten siguiendo una distribución de Zipf
+CATEGORIES = [
+    'Literatura Latinoamericana', 'Novela Contemporánea', 'Realismo Mágico',
+    'Ciencia Ficción', 'Fantasía', 'Misterio y Suspenso', 'Novela Histórica',
+    'Literatura Clásica', 'Literatura Infantil', 'Juvenil', 'Romance',
+    'Biografías', 'Historia', 'Filosofía', 'Psicología', 'Autoayuda',
+    'Negocios', 'Economía', 'Ciencia', 'Tecnología', 'Programación',
+    'Arte', 'Fotografía', 'Cocina', 'Viajes', 'Poesía', 'Teatro',
+    'Ensayo', 'Cómics y Novela Gráfica', 'Literatura Brasileña',
+]
+
+# Peso relativo de cada país proveedor (UK se omite por ser alias de GB)
+COUNTRY_WEIGHTS = {
+    'US': 30, 'ES': 18, 'MX': 12, 'GB': 9, 'AR': 7, 'CO': 6, 'DE': 4,
+    'FR': 4, 'BR': 4, 'CL': 3, 'PE': 2, 'IT': 1,
+}
+
+TITLE_NOUNS = [
+    'La sombra', 'El jardín', 'La ciudad', 'El silencio', 'La memoria', 'El viaje',
+    'La casa', 'El río', 'La noche', 'El laberinto', 'La isla', 'El espejo',
+    'La tormenta', 'El secreto', 'La herencia', 'El último verano', 'La frontera',
+    'El archivo', 'La promesa', 'El invierno',
+]
+TITLE_COMPLEMENTS = [
+    'del viento', 'de los espejos', 'sin nombre', 'de cristal', 'perdida',
+    'del norte', 'de las horas', 'en llamas', 'de papel', 'del olvido',
+    'infinita', 'de medianoche', 'de los suspiros', 'del sur', 'prometida',
+]
+FIRST_NAMES = [
+    'Ana', 'Carlos', 'Lucía', 'Mateo', 'Valentina', 'Diego', 'Camila', 'Javier',
+    'Sofía', 'Andrés', 'Isabel', 'Tomás', 'Martina', 'Gabriel', 'Elena', 'Rafael',
+    'Paula', 'Hugo', 'Clara', 'Manuel',
+]
+LAST_NAMES = [
+    'García', 'Rodríguez', 'López', 'Martínez', 'Fernández', 'Pérez', 'Gómez',
+    'Sánchez', 'Díaz', 'Torres', 'Ramírez', 'Flores', 'Castro', 'Vargas',
+    'Rojas', 'Morales', 'Herrera', 'Silva', 'Mendoza', 'Navarro',
+]
+
+# Fecha fija de referencia: created_at se reparte en los 3 años anteriores, sin depender
+# del momento de ejecución, para que la misma semilla genere siempre los mismos datos
+TIMESTAMP_ANCHOR = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+ISBN_PREFIX = '979'
+ISBN_SPACE = 10 ** 9
+# Multiplicador coprimo con 10^9: permuta los índices para que los ISBN no sean consecutivos
+ISBN_PERMUTATION = 387_420_489
+
+COPY_COLUMNS = (
+    'title', 'author', 'isbn', 'cost_usd', 'selling_price_local', 'stock_quantity',
+    'category_id', 'supplier_id', 'created_at', 'updated_at',
+)
+
+
+# Generador compartido con los procesos hijos (se hereda al hacer fork)
+_generator = None
+
+
+def _load_batch(batch):
+    batch_start, size = batch
+    _generator.load_batch(batch_start, size)
+    return size
+
+
+@contextmanager
+def _manual_timestamps(model, *field_names):
+    """Desactiva auto_now/auto_now_add para conservar las fechas generadas."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _isbn_group_sums(first_weight):
+    """Suma ponderada del dígito de control para cada grupo de 3 dígitos."""
+    weights = (first_weight, 4 - first_weight, first_weight)
+    return [
+        sum(int(digit) * weight for digit, weight in zip(f'{value:03d}', weights))
+        for value in range(1000)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Generar un catálogo sintético y determinista de libros para pruebas de rendimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=100_000, help='Cantidad de libros a generar')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador aleatorio')
+        parser.add_argument('--batch-size', type=int, default=50_000, help='Libros por lote')
+        parser.add_argument(
+            '--start',
+            type=int,
+            default=0,
+            help='Índice inicial de la secuencia de ISBN (para agregar a un catálogo ya generado)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Procesos que cargan lotes en paralelo, cada uno con su conexión',
+        )
+        parser.add_argument(
+            '--method',
+            choices=['copy', 'bulk'],
+            default=None,
+            help='copy (PostgreSQL COPY) o bulk (bulk_create); por defecto copy en PostgreSQL',
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        start = options['start']
+        batch_size = options['batch_size']
+        method = options['method'] or ('copy' if connection.vendor == 'postgresql' else 'bulk')
+
+        if count <= 0 or batch_size <= 0:
+            raise CommandError('--count y --batch-size deben ser mayores a 0.')
+        if start < 0 or start + count > ISBN_SPACE:
+            raise CommandError(f'La secuencia de ISBN admite como máximo {ISBN_SPACE} libros.')
+        if method == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('El método copy requiere PostgreSQL.')
+
+        self.seed = options['seed']
+        self.method = method
+        self._prepare_lookups()
+
+        batches = [
+            (batch_start, min(batch_size, start + count - batch_start))
+            for batch_start in range(start, start + count, batch_size)
+        ]
+        workers = max(1, min(options['workers'], len(batches)))
+        self.stdout.write(
+            f'Generando {count} libros (método {method}, lotes de {batch_size}, {workers} procesos)...'
+        )
+
+        started = time.monotonic()
+        done = 0
+        try:
+            for size in self._run_batches(batches, workers):
+                done += size
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'  {done}/{count} ({done / elapsed:,.0f} libros/s)')
+        except IntegrityError:
+            raise CommandError(
+                'Ya existen libros con ISBN de esta secuencia; usar --start para continuarla.'
+            )
+        finally:
+            # Las cargas masivas no pasan por las señales que mantienen los contadores;
+            # cada lote se confirma por separado, así que se recalculan aunque uno falle
+            Category.refresh_counters()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write('')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Completado: {count} libros en {elapsed:.1f}s ({count / elapsed:,.0f} libros/s)'
+            )
+        )
+
+    def _run_batches(self, batches, workers):
+        if workers == 1:
+            for batch_start, size in batches:
+                self.load_batch(batch_start, size)
+                yield size
+            return
+
+        global _generator
+        _generator = self
+        # Cada proceso hijo debe abrir su propia conexión
+        connections.close_all()
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            yield from pool.imap_unordered(_load_batch, batches)
+
+    def load_batch(self, batch_start, size):
+        rows = self._generate_rows(batch_start, size)
+        if self.method == 'copy':
+            self._copy_rows(rows)
+        else:
+            self._bulk_create_rows(rows)
+
+    def _prepare_lookups(self):
+        self.category_ids = [CatalogService.get_category(name).id for name in CATEGORIES]
+        self.category_weights = list(itertools.accumulate(
+            1 / (rank ** 1.1) for rank in range(1, len(CATEGORIES) + 1)
+        ))
+
+        countries = [
+            country for country in COUNTRY_WEIGHTS
+            if country in ExchangeRateService.COUNTRY_TO_CURRENCY
+        ]
+        self.supplier_ids = [CatalogService.get_supplier(country).id for country in countries]
+        self.supplier_weights = list(itertools.accumulate(COUNTRY_WEIGHTS[c] for c in countries))
+
+        self.titles = [f'{noun} {complement}' for noun in TITLE_NOUNS for complement in TITLE_COMPLEMENTS]
+        self.authors = [f'{first} {last}' for first in FIRST_NAMES for last in LAST_NAMES]
+
+        self.isbn_prefix_sum = sum(
+            int(digit) * (1 if position % 2 == 0 else 3)
+            for position, digit in enumerate(ISBN_PREFIX)
+        )
+        # Posiciones 3-5 y 9-11 empiezan con peso 3; 6-8 con peso 1
+        self.isbn_group_sums = (_isbn_group_sums(3), _isbn_group_sums(1), _isbn_group_sums(3))
+
+    def _isbn(self, index):
+        body = (index * ISBN_PERMUTATION) % ISBN_SPACE
+        high, mid, low = body // 1_000_000, (body // 1000) % 1000, body % 1000
+        total = (
+            self.isbn_prefix_sum
+            + self.isbn_group_sums[0][high]
+            + self.isbn_group_sums[1][mid]
+            + self.isbn_group_sums[2][low]
+        )
+        return f'{ISBN_PREFIX}{body:09d}{(10 - total % 10) % 10}'
+
+    @staticmethod
+    def _stock(rng):
+        """Stock con una cola de libros agotados o con stock bajo."""
+        roll = rng.random()
+        if roll < 0.05:
+            return 0
+        if roll < 0.20:
+            return rng.randint(1, 10)
+        return min(int(rng.lognormvariate(3.5, 0.8)) + 11, 5000)
+
+    @staticmethod
+    def _cost(rng):
+        cost = min(max(rng.lognormvariate(2.6, 0.5), 1.0), 999.99)
+        return Decimal(f'{cost:.2f}')
+
+    def _generate_rows(self, batch_start, size):
+        # Semilla por lote: el resultado no depende del número de procesos ni del orden de carga
+        rng = random.Random(f'{self.seed}:{batch_start}')
+        category_ids = rng.choices(self.category_ids, cum_weights=self.category_weights, k=size)
+        supplier_ids = rng.choices(self.supplier_ids, cum_weights=self.supplier_weights, k=size)
+        titles = rng.choices(self.titles, k=size)
+        authors = rng.choices(self.authors, k=size)
+
+        rows = []
+        for offset in range(size):
+            index = batch_start + offset
+            created_at = TIMESTAMP_ANCHOR - timedelta(seconds=rng.randrange(3 * 365 * 24 * 3600))
+            rows.append((
+                f'{titles[offset]} {index}',
+                authors[offset],
+                self._isbn(index),
+                self._cost(rng),
+                self._stock(rng),
+                category_ids[offset],
+                supplier_ids[offset],
+                created_at,
+            ))
+        return rows
+
+    def _copy_rows(self, rows):
+        buffer = io.StringIO()
+        for title, author, isbn, cost, stock, category_id, supplier_id, created_at in rows:
+            timestamp = created_at.isoformat()
+            buffer.write(
+                f'{title}\t{author}\t{isbn}\t{cost}\t\\N\t{stock}\t'
+                f'{category_id}\t{supplier_id}\t{timestamp}\t{timestamp}\n'
+            )
+        buffer.seek(0)
+
+        sql = f'COPY {Book._meta.db_table} ({", ".join(COPY_COLUMNS)}) FROM STDIN'
+        with transaction.atomic(), connection.cursor() as cursor, connection.wrap_database_errors:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, 'copy_expert'):
+                raw_cursor.copy_expert(sql, buffer)
+            else:
+                # psycopg 3
+                with raw_cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+
+    def _bulk_create_rows(self, rows):
+        books = [
+            Book(
+                title=title,
+                author=author,
+                isbn=isbn,
+                cost_usd=cost,
+                stock_quantity=stock,
+                category_id=category_id,
+                supplier_id=supplier_id,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            for title, author, isbn, cost, stock, category_id, supplier_id, created_at in rows
+        ]
+        with _manual_timestamps(Book, 'created_at', 'updated_at'):
+            Book.objects.bulk_create(books, batch_size=5000)
@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from books.models import RepricingJob
+from books.services import RepricingService
+
+
+class Command(BaseCommand):
+    help = 'Worker que detecta cambios en las tasas de cambio y reprecia los libros afectados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Ejecutar un solo ciclo y terminar',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=settings.REPRICING_POLL_INTERVAL,
+            help='Segundos entre verificaciones de tasas',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.REPRICING_CHUNK_SIZE,
+            help='Libros actualizados por lote',
+        )
+        parser.add_argument(
+            '--no-check',
+            action='store_true',
+            help='Solo consumir la cola, sin consultar las tasas actuales',
+        )
+        parser.add_argument(
+            '--stats',
+            action='store_true',
+            help='Mostrar profundidad y retraso de la cola y terminar',
+        )
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            self._print_stats()
+            return
+
+        while True:
+            if not options['no_check']:
+                for job in RepricingService.check_rates():
+                    self.stdout.write(
+                        f'Encolado reprecio {job.currency}: {job.previous_rate} -> {job.rate}'
+                    )
+
+            while (job := RepricingService.claim_job()) is not None:
+                try:
+                    updated = RepricingService.process_job(job, chunk_size=options['chunk_size'])
+                except Exception as e:
+                    self.stdout.write(self.style.ERROR(f'✗ Reprecio {job.currency} fallido: {e}'))
+                    continue
+                if job.status != RepricingJob.STATUS_DONE:
+                    self.stdout.write(self.style.WARNING(
+                        f'Reprecio {job.currency} detenido ({job.status}) tras {updated} libros'
+                    ))
+                    continue
+                self.stdout.write(
+                    self.style.SUCCESS(f'✓ Reprecio {job.currency}: {updated} libros actualizados')
+                )
+
+            if options['once']:
+                break
+            time.sleep(options['interval'])
+
+    def _print_stats(self):
+        stats = RepricingService.queue_stats()
+        self.stdout.write(f"Pendientes: {stats['pending']}")
+        self.stdout.write(f"En ejecución: {stats['running']}")
+        self.stdout.write(f"Retraso: {stats['lag_seconds']}s")
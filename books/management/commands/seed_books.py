@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from books.models import Book
+from books.services import CatalogService
 from decimal import Decimal
 
 
@@ -104,6 +105,8 @@ class Command(BaseCommand):
         skipped_count = 0
 
         for book_data in books_data:
+            book_data['category'] = CatalogService.get_category(book_data['category'])
+            book_data['supplier'] = CatalogService.get_supplier(book_data.pop('supplier_country'))
             book, created = Book.objects.get_or_create(
                 isbn=book_data['isbn'],
                 defaults=book_data
@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRateSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, verbose_name='Moneda')),
+                ('rate', models.DecimalField(decimal_places=6, max_digits=18, verbose_name='Tasa de cambio')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Tasa de cambio registrada',
+                'verbose_name_plural': 'Tasas de cambio registradas',
+                'db_table': 'exchange_rate_snapshots',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RepricingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, verbose_name='Moneda')),
+                ('rate', models.DecimalField(decimal_places=6, max_digits=18, verbose_name='Tasa de cambio')),
+                ('previous_rate', models.DecimalField(blank=True, decimal_places=6, max_digits=18, null=True, verbose_name='Tasa anterior')),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('running', 'En ejecución'), ('done', 'Completado'), ('failed', 'Fallido'), ('superseded', 'Reemplazado')], default='pending', max_length=10, verbose_name='Estado')),
+                ('last_book_id', models.BigIntegerField(default=0)),
+                ('books_updated', models.PositiveIntegerField(default=0, verbose_name='Libros actualizados')),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Trabajo de reprecio',
+                'verbose_name_plural': 'Trabajos de reprecio',
+                'db_table': 'repricing_jobs',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['supplier_country', 'id'], name='books_country_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exchangeratesnapshot',
+            index=models.Index(fields=['currency', '-created_at'], name='rate_snap_currency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repricingjob',
+            index=models.Index(fields=['status', 'created_at'], name='repricing_status_idx'),
+        ),
+    ]
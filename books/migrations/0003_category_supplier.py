@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-19 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_repricing_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Nombre')),
+                ('book_count', models.PositiveIntegerField(default=0, verbose_name='Cantidad de libros')),
+                ('stock_total', models.PositiveBigIntegerField(default=0, verbose_name='Stock total')),
+            ],
+            options={
+                'verbose_name': 'Categoría',
+                'verbose_name_plural': 'Categorías',
+                'db_table': 'categories',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Supplier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country_code', models.CharField(help_text='Código ISO de 2 letras (ej: ES, US, MX)', max_length=2, unique=True, verbose_name='País')),
+                ('currency', models.CharField(db_index=True, max_length=3, verbose_name='Moneda')),
+            ],
+            options={
+                'verbose_name': 'Proveedor',
+                'verbose_name_plural': 'Proveedores',
+                'db_table': 'suppliers',
+                'ordering': ['country_code'],
+            },
+        ),
+        # Los campos de texto pasan a ser opcionales para que la migración sea reversible
+        migrations.AlterField(
+            model_name='book',
+            name='category',
+            field=models.CharField(max_length=100, null=True, verbose_name='Categoría'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='supplier_country',
+            field=models.CharField(help_text='Código ISO de 2 letras (ej: ES, US, MX)', max_length=2, null=True, verbose_name='País del proveedor'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='category_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='books', to='books.category', verbose_name='Categoría'),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='supplier',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='books', to='books.supplier', verbose_name='Proveedor'),
+        ),
+    ]
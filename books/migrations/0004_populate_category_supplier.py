@@ -0,0 +1,76 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import Upper
+
+
+# Copia de ExchangeRateService.COUNTRY_TO_CURRENCY al momento de la migración
+COUNTRY_TO_CURRENCY = {
+    'ES': 'EUR',
+    'FR': 'EUR',
+    'DE': 'EUR',
+    'IT': 'EUR',
+    'GB': 'GBP',
+    'UK': 'GBP',
+    'US': 'USD',
+    'MX': 'MXN',
+    'CO': 'COP',
+    'AR': 'ARS',
+    'CL': 'CLP',
+    'PE': 'PEN',
+    'BR': 'BRL',
+}
+
+
+def populate_lookups(apps, schema_editor):
+    """Crea categorías y proveedores a partir de los valores de texto y enlaza los libros."""
+    Book = apps.get_model('books', 'Book')
+    Category = apps.get_model('books', 'Category')
+    Supplier = apps.get_model('books', 'Supplier')
+
+    category_stats = (
+        Book.objects.order_by()
+        .values('category')
+        .annotate(book_count=Count('id'), stock_total=Sum('stock_quantity'))
+    )
+    for row in category_stats:
+        category = Category.objects.create(
+            name=row['category'],
+            book_count=row['book_count'],
+            stock_total=row['stock_total'] or 0,
+        )
+        Book.objects.filter(category=row['category']).update(category_ref=category)
+
+    country_codes = (
+        Book.objects.order_by()
+        .annotate(country_code=Upper('supplier_country'))
+        .values_list('country_code', flat=True)
+        .distinct()
+    )
+    for country_code in list(country_codes):
+        supplier = Supplier.objects.create(
+            country_code=country_code,
+            currency=COUNTRY_TO_CURRENCY.get(country_code, 'USD'),
+        )
+        Book.objects.filter(supplier_country__iexact=country_code).update(supplier=supplier)
+
+
+def restore_text_fields(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    Category = apps.get_model('books', 'Category')
+    Supplier = apps.get_model('books', 'Supplier')
+
+    for category in Category.objects.all():
+        Book.objects.filter(category_ref=category).update(category=category.name)
+    for supplier in Supplier.objects.all():
+        Book.objects.filter(supplier=supplier).update(supplier_country=supplier.country_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0003_category_supplier'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_lookups, restore_text_fields),
+    ]
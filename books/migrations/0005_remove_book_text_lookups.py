@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-19 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0004_populate_category_supplier'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='book',
+            name='books_country_id_idx',
+        ),
+        migrations.RemoveField(
+            model_name='book',
+            name='category',
+        ),
+        migrations.RemoveField(
+            model_name='book',
+            name='supplier_country',
+        ),
+        migrations.RenameField(
+            model_name='book',
+            old_name='category_ref',
+            new_name='category',
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='books', to='books.category', verbose_name='Categoría'),
+        ),
+        migrations.AlterField(
+            model_name='book',
+            name='supplier',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='books', to='books.supplier', verbose_name='Proveedor'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['supplier', 'id'], name='books_supplier_id_idx'),
+        ),
+    ]
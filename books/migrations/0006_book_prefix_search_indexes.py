@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 13:00
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_remove_book_text_lookups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='text_pattern_ops'), name='books_title_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('author'), name='text_pattern_ops'), name='books_author_prefix_idx'),
+        ),
+    ]
@@ -1,5 +1,7 @@
 import re
-from django.db import models
+from django.contrib.postgres.indexes import OpClass
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Upper
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 
@@ -18,6 +20,57 @@ def validate_isbn(value):
         raise ValidationError('ISBN contiene caracteres inválidos.')
 
 
+class Category(models.Model):
+    """Categoría de libros con contadores mantenidos de libros y stock."""
+
+    name = models.CharField(max_length=100, unique=True, verbose_name='Nombre')
+    book_count = models.PositiveIntegerField(default=0, verbose_name='Cantidad de libros')
+    stock_total = models.PositiveBigIntegerField(default=0, verbose_name='Stock total')
+
+    class Meta:
+        db_table = 'categories'
+        ordering = ['name']
+        verbose_name = 'Categoría'
+        verbose_name_plural = 'Categorías'
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def refresh_counters(cls):
+        """Recalcula los contadores de todas las categorías con un único UPDATE."""
+        books = Book.objects.filter(category=models.OuterRef('pk')).order_by().values('category')
+        cls.objects.update(
+            book_count=Coalesce(
+                models.Subquery(books.annotate(total=models.Count('id')).values('total')), 0
+            ),
+            stock_total=Coalesce(
+                models.Subquery(books.annotate(total=models.Sum('stock_quantity')).values('total')), 0
+            ),
+        )
+
+
+class Supplier(models.Model):
+    """País proveedor con la moneda en la que factura."""
+
+    country_code = models.CharField(
+        max_length=2,
+        unique=True,
+        verbose_name='País',
+        help_text='Código ISO de 2 letras (ej: ES, US, MX)'
+    )
+    currency = models.CharField(max_length=3, db_index=True, verbose_name='Moneda')
+
+    class Meta:
+        db_table = 'suppliers'
+        ordering = ['country_code']
+        verbose_name = 'Proveedor'
+        verbose_name_plural = 'Proveedores'
+
+    def __str__(self):
+        return f"{self.country_code} ({self.currency})"
+
+
 class Book(models.Model):
     """Modelo para representar un libro en el inventario."""
     
@@ -46,11 +99,17 @@ class Book(models.Model):
         default=0,
         verbose_name='Cantidad en stock'
     )
-    category = models.CharField(max_length=100, verbose_name='Categoría')
-    supplier_country = models.CharField(
-        max_length=2,
-        verbose_name='País del proveedor',
-        help_text='Código ISO de 2 letras (ej: ES, US, MX)'
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.PROTECT,
+        related_name='books',
+        verbose_name='Categoría'
+    )
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.PROTECT,
+        related_name='books',
+        verbose_name='Proveedor'
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -60,6 +119,105 @@ class Book(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Libro'
         verbose_name_plural = 'Libros'
+        indexes = [
+            # Permite recorrer por proveedor en orden de id durante el reprecio por lotes
+            models.Index(fields=['supplier', 'id'], name='books_supplier_id_idx'),
+            # Búsqueda por prefijo sin distinguir mayúsculas (istartswith) en el admin
+            models.Index(
+                OpClass(Upper('title'), name='text_pattern_ops'), name='books_title_prefix_idx'
+            ),
+            models.Index(
+                OpClass(Upper('author'), name='text_pattern_ops'), name='books_author_prefix_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.author}"
+
+    def save(self, *args, **kwargs):
+        # Los contadores de la categoría se actualizan en señales; el guardado y el
+        # ajuste deben confirmarse juntos y con la fila del libro bloqueada
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+
+class ExchangeRateSnapshot(models.Model):
+    """Tasa de cambio USD -> moneda observada en un momento dado."""
+
+    currency = models.CharField(max_length=3, verbose_name='Moneda')
+    rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=6,
+        verbose_name='Tasa de cambio'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'exchange_rate_snapshots'
+        ordering = ['-created_at']
+        verbose_name = 'Tasa de cambio registrada'
+        verbose_name_plural = 'Tasas de cambio registradas'
+        indexes = [
+            models.Index(fields=['currency', '-created_at'], name='rate_snap_currency_idx'),
+        ]
+
+    def __str__(self):
+        return f"USD -> {self.currency} = {self.rate}"
+
+
+class RepricingJob(models.Model):
+    """Trabajo encolado para recalcular precios de una moneda tras un cambio de tasa."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_SUPERSEDED = 'superseded'
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En ejecución'),
+        (STATUS_DONE, 'Completado'),
+        (STATUS_FAILED, 'Fallido'),
+        (STATUS_SUPERSEDED, 'Reemplazado'),
+    ]
+
+    currency = models.CharField(max_length=3, verbose_name='Moneda')
+    rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=6,
+        verbose_name='Tasa de cambio'
+    )
+    previous_rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name='Tasa anterior'
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name='Estado'
+    )
+    # Último id procesado; permite reanudar un trabajo interrumpido
+    last_book_id = models.BigIntegerField(default=0)
+    books_updated = models.PositiveIntegerField(default=0, verbose_name='Libros actualizados')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'repricing_jobs'
+        ordering = ['created_at']
+        verbose_name = 'Trabajo de reprecio'
+        verbose_name_plural = 'Trabajos de reprecio'
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='repricing_status_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.title} - {self.author}"
\ No newline at end of file
+        return f"Reprecio {self.currency} ({self.get_status_display()})"
\ No newline at end of file
@@ -0,0 +1,73 @@
+import json
+
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator que, en PostgreSQL, usa la estimación del planificador (EXPLAIN)
+    en lugar de COUNT(*) cuando el listado sin filtros es grande. Con filtros o
+    búsqueda se cuenta exactamente, porque la estimación puede quedarse corta.
+    """
+
+    # Por debajo de esta estimación se cuenta exactamente, ya que es barato
+    EXACT_COUNT_LIMIT = 10000
+
+    is_estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is None or estimate < self.EXACT_COUNT_LIMIT:
+            return super().count
+        self.is_estimated = True
+        return estimate
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            number = int(number)
+            if not self.is_estimated or number < 1:
+                raise
+            # Con un total estimado puede haber páginas más allá; page() lo comprueba
+            return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.is_estimated:
+            return super().page(number)
+
+        # En la última página estimada se pide una fila de más para saber si hay otra
+        bottom = (number - 1) * self.per_page
+        limit = self.per_page + 1 if number >= self.num_pages else self.per_page
+        objects = list(self.object_list[bottom:bottom + limit])
+        if len(objects) < limit or number >= self.num_pages:
+            # La estimación no coincide con el final real: se corrige el total para no
+            # dejar libros inaccesibles ni anunciar páginas vacías
+            if not objects and number > 1:
+                raise EmptyPage('Esa página no contiene resultados')
+            self.count = bottom + len(objects)
+            self.__dict__.pop('num_pages', None)
+        return self._get_page(objects[:self.per_page], number, self)
+
+    def _estimate(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query') or connections[queryset.db].vendor != 'postgresql':
+            return None
+        if queryset.query.where:
+            return None
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        # Según el driver llega como texto, como lista de un elemento o como dict
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        if isinstance(plan, list):
+            plan = plan[0]
+        return int(plan['Plan']['Plan Rows'])
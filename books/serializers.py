@@ -1,18 +1,23 @@
 from rest_framework import serializers
 from .models import Book
+from .services import CatalogService
 
 
 class BookSerializer(serializers.ModelSerializer):
     """Serializer para el modelo Book con validaciones."""
     
+    # Se exponen por nombre y código de país; internamente son FKs a tablas de búsqueda
+    category = serializers.CharField(source='category.name', max_length=100)
+    supplier_country = serializers.CharField(source='supplier.country_code', max_length=2)
+    
     class Meta:
         model = Book
         fields = [
             'id', 'title', 'author', 'isbn', 'cost_usd',
-            'selling_price_local', 'stock_quantity', 'category',
+            'selling_price_local', 'stock_quantity', 'category', 'category_id',
             'supplier_country', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'category_id', 'created_at', 'updated_at']
     
     def validate_cost_usd(self, value):
         """Valida que el costo sea mayor a 0."""
@@ -32,4 +37,22 @@ class BookSerializer(serializers.ModelSerializer):
         
         if queryset.exists():
             raise serializers.ValidationError("Ya existe un libro con este ISBN.")
-        return value
\ No newline at end of file
+        return value
+    
+    def create(self, validated_data):
+        return super().create(self._resolve_lookups(validated_data))
+    
+    def update(self, instance, validated_data):
+        return super().update(instance, self._resolve_lookups(validated_data))
+    
+    def _resolve_lookups(self, validated_data):
+        """Reemplaza el nombre de categoría y el código de país por sus filas de búsqueda."""
+        if 'category' in validated_data:
+            validated_data['category'] = CatalogService.get_category(
+                validated_data['category']['name']
+            )
+        if 'supplier' in validated_data:
+            validated_data['supplier'] = CatalogService.get_supplier(
+                validated_data['supplier']['country_code']
+            )
+        return validated_data
@@ -1,16 +1,25 @@
+import hashlib
 import requests
+import uuid
+from datetime import timedelta
 from decimal import Decimal, ROUND_HALF_UP
+from django.core.cache import cache, caches
+from django.db import connections, transaction
+from django.db.models import Case, CharField, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Greatest, Round
 from django.utils import timezone
 from django.conf import settings
 import logging
 
+from .models import Book, Category, ExchangeRateSnapshot, RepricingJob, Supplier
+
 logger = logging.getLogger(__name__)
 
 
 class ExchangeRateService:
     """Servicio para obtener tasas de cambio desde API externa."""
     
-    API_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+    API_URL = settings.EXCHANGE_RATE_API_URL
     TIMEOUT = 5  # segundos
     
     # Tasas por defecto en caso de fallo de la API
@@ -86,12 +95,190 @@ class ExchangeRateService:
             logger.error(f"Error al procesar respuesta de API: {str(e)}")
             return cls._get_default_rate(target_currency), False
     
+    @classmethod
+    def get_all_rates(cls) -> tuple[dict[str, Decimal], bool]:
+        """
+        Obtiene en una sola llamada las tasas USD -> moneda de todas las monedas soportadas.
+        
+        Returns:
+            tuple: (tasas_por_moneda, es_tasa_real)
+            - es_tasa_real: False si alguna tasa proviene de los valores por defecto
+        """
+        try:
+            response = requests.get(cls.API_URL, timeout=cls.TIMEOUT)
+            response.raise_for_status()
+            api_rates = response.json().get('rates', {})
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error al obtener tasas de cambio: {str(e)}")
+            return dict(cls.DEFAULT_RATES), False
+        except (KeyError, ValueError) as e:
+            logger.error(f"Error al procesar respuesta de API: {str(e)}")
+            return dict(cls.DEFAULT_RATES), False
+        
+        rates = {}
+        is_live = True
+        for currency in cls.DEFAULT_RATES:
+            if currency in api_rates:
+                rates[currency] = Decimal(str(api_rates[currency]))
+            else:
+                logger.warning(f"Moneda {currency} no encontrada en API, usando tasa por defecto")
+                rates[currency] = cls._get_default_rate(currency)
+                is_live = False
+        return rates, is_live
+    
     @classmethod
     def _get_default_rate(cls, currency: str) -> Decimal:
         """Retorna la tasa por defecto para una moneda."""
         return cls.DEFAULT_RATES.get(currency, Decimal('1.00'))
 
 
+class CatalogService:
+    """Resolución de categorías y proveedores en sus tablas de búsqueda."""
+    
+    @classmethod
+    def get_category(cls, name: str) -> Category:
+        """Obtiene o crea la categoría con el nombre dado."""
+        category, _ = Category.objects.get_or_create(name=name.strip())
+        return category
+    
+    @classmethod
+    def get_supplier(cls, country_code: str) -> Supplier:
+        """Obtiene o crea el proveedor de un país, asignándole la moneda de ese país."""
+        country_code = country_code.upper()
+        supplier, _ = Supplier.objects.get_or_create(
+            country_code=country_code,
+            defaults={'currency': ExchangeRateService.get_currency_for_country(country_code)}
+        )
+        return supplier
+
+
+class BookCacheService:
+    """
+    Caché del detalle serializado de cada libro, por id, y del id de cada ISBN.
+    
+    Solo se invalida la entrada por id; la entrada por ISBN se valida contra
+    el ISBN del detalle al leerla, por lo que no puede devolver datos ajenos.
+    Todas las claves incluyen una generación: cambiarla invalida la caché
+    completa (tras reprecios masivos o al editar categorías y proveedores).
+    Las invalidaciones se aplican al confirmar la transacción en curso.
+    
+    Desactivada por defecto: solo se usa con BOOK_CACHE_TIMEOUT > 0 y una caché
+    compartida entre procesos (p. ej. Redis). Con una caché local cada proceso
+    vería invalidaciones distintas, y sin caché basta la consulta IN por lotes.
+    """
+    
+    GENERATION_KEY = 'book_cache_generation'
+    LOCAL_BACKENDS = ('LocMemCache', 'DummyCache')
+    
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return (
+            settings.BOOK_CACHE_TIMEOUT > 0
+            and type(caches['default']).__name__ not in cls.LOCAL_BACKENDS
+        )
+    
+    @staticmethod
+    def _id_key(generation: str, book_id) -> str:
+        return f"book:{generation}:{book_id}"
+    
+    @staticmethod
+    def _isbn_key(generation: str, isbn: str) -> str:
+        return f"book_isbn:{generation}:{isbn}"
+    
+    @classmethod
+    def _generation(cls) -> str:
+        generation = cache.get(cls.GENERATION_KEY)
+        if generation is None:
+            cache.add(cls.GENERATION_KEY, uuid.uuid4().hex, None)
+            generation = cache.get(cls.GENERATION_KEY)
+        return generation
+    
+    @classmethod
+    def get_many(cls, book_ids, generation: str = None) -> dict:
+        """Retorna {id: detalle} de los libros presentes en caché."""
+        if not cls.is_enabled():
+            return {}
+        generation = generation or cls._generation()
+        cached = cache.get_many([cls._id_key(generation, book_id) for book_id in book_ids])
+        return {data['id']: data for data in cached.values()}
+    
+    @classmethod
+    def get_many_by_isbn(cls, isbns) -> dict:
+        """Retorna {isbn: detalle} de los libros presentes en caché."""
+        if not cls.is_enabled():
+            return {}
+        generation = cls._generation()
+        id_by_key = cache.get_many([cls._isbn_key(generation, isbn) for isbn in isbns])
+        by_id = cls.get_many(id_by_key.values(), generation)
+        return {
+            data['isbn']: data for data in by_id.values()
+            if cls._isbn_key(generation, data['isbn']) in id_by_key
+        }
+    
+    @classmethod
+    def set_many(cls, books_data) -> None:
+        if not cls.is_enabled():
+            return
+        generation = cls._generation()
+        entries = {}
+        for data in books_data:
+            entries[cls._id_key(generation, data['id'])] = data
+            entries[cls._isbn_key(generation, data['isbn'])] = data['id']
+        cache.set_many(entries, settings.BOOK_CACHE_TIMEOUT)
+    
+    @classmethod
+    def invalidate(cls, book_ids) -> None:
+        if not cls.is_enabled():
+            return
+        book_ids = list(book_ids)
+        transaction.on_commit(lambda: cache.delete_many(
+            [cls._id_key(cls._generation(), book_id) for book_id in book_ids]
+        ))
+    
+    @classmethod
+    def invalidate_all(cls) -> None:
+        if not cls.is_enabled():
+            return
+        transaction.on_commit(lambda: cache.set(cls.GENERATION_KEY, uuid.uuid4().hex, None))
+
+
+class InventoryService:
+    """Operaciones de stock sobre conjuntos de libros."""
+    
+    @classmethod
+    def adjust_stock(cls, queryset, delta: int) -> int:
+        """
+        Suma `delta` al stock de todos los libros del queryset con un único UPDATE
+        (sin bajar de 0) y ajusta los contadores de las categorías afectadas.
+        
+        Returns:
+            int: cantidad de libros actualizados
+        """
+        new_stock = Greatest(F('stock_quantity') + delta, 0)
+        with transaction.atomic():
+            # Bloquea las filas (en orden de id, igual que Book.save) para que un guardado
+            # concurrente no cambie categoría o stock entre el cálculo y el UPDATE
+            book_ids = list(
+                Book.objects.filter(pk__in=queryset.values('pk'))
+                .select_for_update().order_by('pk').values_list('pk', flat=True)
+            )
+            books = Book.objects.filter(pk__in=book_ids)
+            # Variación real por categoría, calculada antes del UPDATE por el límite en 0
+            category_deltas = (
+                books.order_by()
+                .values('category_id')
+                .annotate(delta=Sum(new_stock - F('stock_quantity')))
+            )
+            for row in category_deltas:
+                if row['delta']:
+                    Category.objects.filter(pk=row['category_id']).update(
+                        stock_total=F('stock_total') + row['delta']
+                    )
+            updated = books.update(stock_quantity=new_stock, updated_at=timezone.now())
+            BookCacheService.invalidate_all()
+        return updated
+
+
 class PriceCalculatorService:
     """Servicio para calcular precios de venta."""
     
@@ -101,8 +288,9 @@ class PriceCalculatorService:
     def calculate_selling_price(
         cls,
         cost_usd: Decimal,
-        country_code: str,
-        margin: Decimal = None
+        country_code: str = None,
+        margin: Decimal = None,
+        currency: str = None
     ) -> dict:
         """
         Calcula el precio de venta sugerido para un libro.
@@ -111,6 +299,7 @@ class PriceCalculatorService:
             cost_usd: Costo en USD
             country_code: Código del país para determinar la moneda
             margin: Margen de ganancia (default 40%)
+            currency: Moneda ya resuelta (ej: la del proveedor); evita el mapeo por país
         
         Returns:
             dict con el detalle del cálculo
@@ -119,7 +308,8 @@ class PriceCalculatorService:
             margin = cls.DEFAULT_MARGIN
         
         # Obtener moneda del país
-        currency = ExchangeRateService.get_currency_for_country(country_code)
+        if currency is None:
+            currency = ExchangeRateService.get_currency_for_country(country_code)
         
         # Obtener tasa de cambio
         exchange_rate, is_live_rate = ExchangeRateService.get_exchange_rate(currency)
@@ -144,4 +334,296 @@ class PriceCalculatorService:
             'currency': currency,
             'is_live_rate': is_live_rate,
             'calculation_timestamp': timezone.now(),
-        }
\ No newline at end of file
+        }
+
+
+class RepricingService:
+    """
+    Cola de reprecio respaldada en base de datos.
+    
+    Compara las tasas actuales con la última registrada por moneda y, cuando la
+    variación supera el umbral configurado, encola un trabajo que recalcula
+    `selling_price_local` solo para los libros de proveedores de esa moneda.
+    """
+    
+    @classmethod
+    def check_rates(cls, threshold: Decimal = None) -> list[RepricingJob]:
+        """
+        Registra las tasas actuales y encola un trabajo por cada moneda cuya
+        variación relativa supere el umbral.
+        
+        No encola nada si la API externa falla, para no repreciar con tasas por defecto.
+        """
+        if threshold is None:
+            threshold = settings.REPRICING_RATE_THRESHOLD
+        
+        rates, is_live_rate = ExchangeRateService.get_all_rates()
+        if not is_live_rate:
+            logger.warning("Tasas no disponibles desde la API, se omite la verificación de reprecio")
+            return []
+        
+        jobs = []
+        for currency, rate in rates.items():
+            last_snapshot = ExchangeRateSnapshot.objects.filter(currency=currency).first()
+            previous_rate = last_snapshot.rate if last_snapshot else None
+            
+            if previous_rate is not None and abs(rate - previous_rate) / previous_rate <= threshold:
+                continue
+            
+            with transaction.atomic():
+                ExchangeRateSnapshot.objects.create(currency=currency, rate=rate)
+                # Un trabajo pendiente o en curso con una tasa anterior ya no tiene sentido;
+                # el worker que lo ejecuta se detiene al comprobar el estado en su siguiente lote
+                RepricingJob.objects.filter(
+                    currency=currency,
+                    status__in=[RepricingJob.STATUS_PENDING, RepricingJob.STATUS_RUNNING],
+                ).update(status=RepricingJob.STATUS_SUPERSEDED, finished_at=timezone.now())
+                job = RepricingJob.objects.create(
+                    currency=currency, rate=rate, previous_rate=previous_rate
+                )
+            logger.info(f"Reprecio encolado: USD -> {currency} {previous_rate} -> {rate}")
+            jobs.append(job)
+        return jobs
+    
+    @classmethod
+    def claim_job(cls) -> RepricingJob | None:
+        """
+        Toma el trabajo pendiente más antiguo usando SKIP LOCKED, de modo que
+        varios workers puedan consumir la cola sin bloquearse entre sí.
+        También recupera trabajos en ejecución abandonados por un worker caído.
+        """
+        stale_before = timezone.now() - timedelta(seconds=settings.REPRICING_STALE_AFTER)
+        with transaction.atomic():
+            job = (
+                RepricingJob.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=RepricingJob.STATUS_PENDING)
+                    | Q(status=RepricingJob.STATUS_RUNNING, updated_at__lt=stale_before)
+                )
+                .order_by('created_at')
+                .first()
+            )
+            if job is None:
+                return None
+            job.status = RepricingJob.STATUS_RUNNING
+            job.started_at = job.started_at or timezone.now()
+            job.save(update_fields=['status', 'started_at', 'updated_at'])
+        return job
+    
+    @classmethod
+    def process_job(cls, job: RepricingJob, chunk_size: int = None) -> int:
+        """
+        Recalcula los precios del trabajo en lotes por rango de id, con un UPDATE
+        por lote. El avance se guarda en cada lote para poder reanudar.
+        
+        Antes de cada lote bloquea el trabajo y verifica que siga en ejecución;
+        si una tasa más reciente lo reemplazó, se detiene sin marcarlo completado.
+        
+        Returns:
+            int: cantidad de libros actualizados
+        """
+        if chunk_size is None:
+            chunk_size = settings.REPRICING_CHUNK_SIZE
+        
+        supplier_ids = list(
+            Supplier.objects.filter(currency=job.currency).values_list('id', flat=True)
+        )
+        selling_price = cls._selling_price_expression(job.rate)
+        
+        try:
+            while True:
+                with transaction.atomic():
+                    # El bloqueo hace esperar a check_rates hasta que termine el lote en curso
+                    status = (
+                        RepricingJob.objects.select_for_update()
+                        .filter(pk=job.pk)
+                        .values_list('status', flat=True)
+                        .first()
+                    )
+                    if status != RepricingJob.STATUS_RUNNING:
+                        job.status = status
+                        logger.info(
+                            f"Reprecio {job.currency} detenido ({status}): "
+                            f"{job.books_updated} libros actualizados"
+                        )
+                        return job.books_updated
+                    ids = list(
+                        Book.objects
+                        .filter(supplier_id__in=supplier_ids, id__gt=job.last_book_id)
+                        .order_by('id')
+                        .values_list('id', flat=True)[:chunk_size]
+                    )
+                    if not ids:
+                        break
+                    updated = Book.objects.filter(id__in=ids).update(
+                        selling_price_local=selling_price,
+                        updated_at=timezone.now(),
+                    )
+                    BookCacheService.invalidate(ids)
+                    job.last_book_id = ids[-1]
+                    job.books_updated += updated
+                    job.save(update_fields=['last_book_id', 'books_updated', 'updated_at'])
+        except Exception as e:
+            logger.error(f"Error en reprecio {job.currency}: {str(e)}")
+            job.status = RepricingJob.STATUS_FAILED
+            job.error = str(e)
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+            raise
+        
+        job.status = RepricingJob.STATUS_DONE
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+        logger.info(f"Reprecio {job.currency} completado: {job.books_updated} libros")
+        return job.books_updated
+    
+    @classmethod
+    def reprice_books(cls, queryset) -> tuple[int, bool]:
+        """
+        Recalcula de inmediato el precio de los libros del queryset con las tasas
+        actuales: un UPDATE por moneda en lugar de un cálculo por libro.
+        
+        Returns:
+            tuple: (libros_actualizados, es_tasa_real)
+        """
+        rates, is_live_rate = ExchangeRateService.get_all_rates()
+        rates['USD'] = Decimal('1.00')
+        
+        updated = 0
+        with transaction.atomic():
+            for currency, rate in rates.items():
+                updated += queryset.order_by().filter(supplier__currency=currency).update(
+                    selling_price_local=cls._selling_price_expression(rate),
+                    updated_at=timezone.now(),
+                )
+            BookCacheService.invalidate_all()
+        return updated, is_live_rate
+    
+    @classmethod
+    def queue_stats(cls) -> dict:
+        """Profundidad de la cola y antigüedad del trabajo pendiente más viejo."""
+        pending = RepricingJob.objects.filter(status=RepricingJob.STATUS_PENDING)
+        oldest = pending.order_by('created_at').values_list('created_at', flat=True).first()
+        lag_seconds = (timezone.now() - oldest).total_seconds() if oldest else 0
+        
+        return {
+            'pending': pending.count(),
+            'running': RepricingJob.objects.filter(status=RepricingJob.STATUS_RUNNING).count(),
+            'oldest_pending_at': oldest,
+            'lag_seconds': round(lag_seconds, 1),
+        }
+    
+    @staticmethod
+    def _selling_price_expression(rate: Decimal):
+        """
+        Expresión SQL equivalente a PriceCalculatorService.calculate_selling_price:
+        redondea el costo local a 2 decimales y luego aplica el margen.
+        """
+        decimal_field = DecimalField(max_digits=18, decimal_places=6)
+        margin_multiplier = Decimal('1') + PriceCalculatorService.DEFAULT_MARGIN
+        cost_local = Round(F('cost_usd') * Value(rate, output_field=decimal_field), 2)
+        return Round(cost_local * Value(margin_multiplier, output_field=decimal_field), 2)
+
+
+class FacetService:
+    """Conteos agrupados (facetas) sobre un queryset de libros ya filtrado."""
+    
+    CACHE_PREFIX = 'book_facets'
+    
+    # (clave, stock mínimo, stock máximo); el umbral de 'low' coincide con /low-stock/
+    STOCK_BANDS = [
+        ('out_of_stock', 0, 0),
+        ('low', 1, 10),
+        ('medium', 11, 50),
+        ('high', 51, None),
+    ]
+    
+    @classmethod
+    def get_facets(cls, queryset) -> dict:
+        """
+        Obtiene los conteos por categoría, país, moneda y banda de stock.
+        
+        Todas las facetas se calculan en una sola consulta con GROUPING SETS y
+        el resultado se cachea usando el SQL del queryset como firma del filtro.
+        """
+        inner = (
+            queryset.order_by()
+            .annotate(
+                category_name=F('category__name'),
+                country_code=F('supplier__country_code'),
+                currency=F('supplier__currency'),
+                stock_band=cls._stock_band_expression(),
+            )
+            .values('category_id', 'category_name', 'country_code', 'currency', 'stock_band')
+        )
+        sql, params = inner.query.sql_with_params()
+        
+        signature = hashlib.sha256(f"{sql}|{params!r}".encode()).hexdigest()
+        cache_key = f"{cls.CACHE_PREFIX}:{signature}"
+        facets = cache.get(cache_key)
+        if facets is None:
+            facets = cls._compute_facets(sql, params, inner.db)
+            cache.set(cache_key, facets, settings.FACETS_CACHE_TIMEOUT)
+        return facets
+    
+    @classmethod
+    def _compute_facets(cls, sql: str, params: tuple, using: str) -> dict:
+        grouped_sql = (
+            "SELECT category_id, category_name, country_code, currency, stock_band, "
+            "GROUPING(category_id), GROUPING(country_code), GROUPING(currency), "
+            "GROUPING(stock_band), COUNT(*) "
+            f"FROM ({sql}) AS filtered_books "
+            "GROUP BY GROUPING SETS ("
+            "(category_id, category_name), (country_code), (currency), (stock_band), ()"
+            ")"
+        )
+        with connections[using].cursor() as cursor:
+            cursor.execute(grouped_sql, params)
+            rows = cursor.fetchall()
+        
+        total = 0
+        categories = []
+        countries = {}
+        currencies = {}
+        bands = {key: 0 for key, _, _ in cls.STOCK_BANDS}
+        for row in rows:
+            category_id, category_name, country, currency, band = row[:5]
+            no_category, no_country, no_currency, no_band, count = row[5:]
+            if not no_category:
+                categories.append({'id': category_id, 'value': category_name, 'count': count})
+            elif not no_country:
+                countries[country] = count
+            elif not no_currency:
+                currencies[currency] = count
+            elif not no_band:
+                bands[band] = count
+            else:
+                total = count
+        
+        categories.sort(key=lambda bucket: (-bucket['count'], bucket['value']))
+        return {
+            'total': total,
+            'category': categories,
+            'supplier_country': cls._as_buckets(countries),
+            'currency': cls._as_buckets(currencies),
+            'stock_band': [{'value': key, 'count': count} for key, count in bands.items()],
+        }
+    
+    @classmethod
+    def _stock_band_expression(cls):
+        whens = []
+        for key, low, high in cls.STOCK_BANDS:
+            condition = Q(stock_quantity__gte=low)
+            if high is not None:
+                condition &= Q(stock_quantity__lte=high)
+            whens.append(When(condition, then=Value(key)))
+        return Case(*whens, output_field=CharField())
+    
+    @staticmethod
+    def _as_buckets(counts: dict) -> list[dict]:
+        """Ordena los conteos de mayor a menor."""
+        return [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        ]
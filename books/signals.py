@@ -0,0 +1,91 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .models import Book, Category, Supplier
+from .services import BookCacheService
+
+
+COUNTER_FIELDS = {'category', 'category_id', 'stock_quantity'}
+
+
+def _adjust_category(category_id, books, stock):
+    """Aplica una variación a los contadores de una categoría con un UPDATE atómico."""
+    if category_id is None or (books == 0 and stock == 0):
+        return
+    Category.objects.filter(pk=category_id).update(
+        book_count=F('book_count') + books,
+        stock_total=F('stock_total') + stock,
+    )
+
+
+def _locked_counter_state(instance, using):
+    """
+    Bloquea la fila del libro y retorna (category_id, stock_quantity) guardados,
+    o None si no existe. Se lee de la base y no de la instancia, que puede estar
+    desactualizada respecto a otro guardado o borrado concurrente.
+    """
+    if instance.pk is None:
+        return None
+    return Book.objects.using(using).select_for_update().filter(pk=instance.pk).values_list(
+        'category_id', 'stock_quantity'
+    ).first()
+
+
+@receiver(pre_save, sender=Book)
+def capture_counter_state(sender, instance, raw, using, update_fields, **kwargs):
+    """Obtiene los valores previos de la fila; Book.save abre la transacción."""
+    if raw or (update_fields is not None and not COUNTER_FIELDS & set(update_fields)):
+        return
+    instance._counter_state = _locked_counter_state(instance, using) or (None, 0)
+
+
+@receiver(post_save, sender=Book)
+def update_category_counters(sender, instance, raw, update_fields, **kwargs):
+    """Mantiene book_count y stock_total de las categorías afectadas."""
+    if raw or (update_fields is not None and not COUNTER_FIELDS & set(update_fields)):
+        return
+
+    old_category_id, old_stock = instance.__dict__.pop('_counter_state')
+    if old_category_id == instance.category_id:
+        _adjust_category(instance.category_id, 0, instance.stock_quantity - old_stock)
+        return
+
+    # Orden fijo de actualización para no provocar deadlocks entre categorías
+    adjustments = sorted(
+        [(old_category_id, -1, -old_stock), (instance.category_id, 1, instance.stock_quantity)],
+        key=lambda adjustment: adjustment[0] or 0,
+    )
+    for category_id, books, stock in adjustments:
+        _adjust_category(category_id, books, stock)
+
+
+@receiver(pre_delete, sender=Book)
+def capture_deleted_state(sender, instance, using, **kwargs):
+    # delete() ya se ejecuta dentro de una transacción
+    instance._counter_state = _locked_counter_state(instance, using)
+
+
+@receiver(post_delete, sender=Book)
+def decrement_category_counters(sender, instance, **kwargs):
+    state = instance.__dict__.pop('_counter_state', None)
+    if state is None:
+        # La fila ya había sido eliminada por otra transacción
+        return
+    category_id, stock = state
+    _adjust_category(category_id, -1, -stock)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_book_cache(sender, instance, **kwargs):
+    BookCacheService.invalidate([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Supplier)
+@receiver(post_delete, sender=Supplier)
+def invalidate_book_cache_for_lookup(sender, instance, **kwargs):
+    # El nombre de la categoría y el código del país forman parte de cada detalle en caché
+    BookCacheService.invalidate_all()
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet
+from .views import BookViewSet, repricing_queue_status
 
 router = DefaultRouter()
 router.register(r'books', BookViewSet, basename='book')
 
 urlpatterns = [
+    path('repricing/queue/', repricing_queue_status, name='repricing-queue'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,12 +1,14 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
-from .models import Book
+from .filters import CategoryFilter
+from .models import Book, Category
 from .serializers import BookSerializer
-from .services import PriceCalculatorService
+from .services import BookCacheService, FacetService, PriceCalculatorService, RepricingService
 
 
 class BookViewSet(viewsets.ModelViewSet):
@@ -20,14 +22,17 @@ class BookViewSet(viewsets.ModelViewSet):
     - PUT /books/{id}/ - Actualizar un libro
     - DELETE /books/{id}/ - Eliminar un libro
     - GET /books/search/?category={category} - Buscar por categoría
+    - GET /books/search/?category_id={id} - Buscar por id de categoría
     - GET /books/low-stock/?threshold={n} - Libros con stock bajo
+    - GET /books/facets/?search={texto} - Conteos por categoría, país, moneda y stock
+    - POST /books/batch-get/ - Obtener varios libros por id o ISBN
     - POST /books/{id}/calculate-price/ - Calcular precio de venta
     """
     
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('category', 'supplier')
     serializer_class = BookSerializer
-    filter_backends = [SearchFilter, OrderingFilter]
-    search_fields = ['title', 'author', 'category', 'isbn']
+    filter_backends = [CategoryFilter, SearchFilter, OrderingFilter]
+    search_fields = ['title', 'author', 'category__name', 'isbn']
     ordering_fields = ['title', 'cost_usd', 'stock_quantity', 'created_at']
     ordering = ['-created_at']
     
@@ -35,17 +40,24 @@ class BookViewSet(viewsets.ModelViewSet):
     def search_by_category(self, request):
         """
         GET /books/search/?category={category}
+        GET /books/search/?category_id={id}
         Buscar libros por categoría.
         """
         category = request.query_params.get('category', None)
+        category_id = request.query_params.get('category_id', None)
         
-        if not category:
+        if not category and not category_id:
             return Response(
-                {"error": "El parámetro 'category' es requerido."},
+                {"error": "El parámetro 'category' o 'category_id' es requerido."},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        books = self.queryset.filter(category__icontains=category)
+        books = CategoryFilter().filter_queryset(request, self.get_queryset(), self)
+        if category:
+            # La búsqueda de texto se hace sobre la tabla de categorías, no sobre cada libro
+            books = books.filter(
+                category__in=Category.objects.filter(name__icontains=category)
+            )
         page = self.paginate_queryset(books)
         
         if page is not None:
@@ -69,7 +81,7 @@ class BookViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        books = self.queryset.filter(stock_quantity__lte=threshold)
+        books = self.get_queryset().filter(stock_quantity__lte=threshold)
         page = self.paginate_queryset(books)
         
         if page is not None:
@@ -79,6 +91,99 @@ class BookViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(books, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='facets')
+    def facets(self, request):
+        """
+        GET /books/facets/?search={texto}
+        Conteos por categoría, país del proveedor, moneda y banda de stock
+        para los mismos filtros que el listado.
+        """
+        books = self.filter_queryset(self.get_queryset())
+        return Response(FacetService.get_facets(books), status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get', 'post'], url_path='batch-get')
+    def batch_get(self, request):
+        """
+        POST /books/batch-get/ con {"ids": [...]} o {"isbns": [...]}
+        GET /books/batch-get/?ids=1,2,3 o ?isbns=...
+        Obtiene varios libros en una sola petición, en el orden solicitado.
+        Los que no existen se devuelven como {"id": ..., "found": false}.
+        """
+        if request.method == 'GET':
+            params = {
+                key: request.query_params[key].split(',')
+                for key in ('ids', 'isbns') if request.query_params.get(key)
+            }
+        else:
+            params = request.data
+        
+        if not isinstance(params, dict):
+            return Response(
+                {"error": "El cuerpo debe ser un objeto JSON con 'ids' o 'isbns'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if 'ids' in params:
+            field, values = 'id', params['ids']
+        elif 'isbns' in params:
+            field, values = 'isbn', params['isbns']
+        else:
+            return Response(
+                {"error": "El parámetro 'ids' o 'isbns' es requerido."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not isinstance(values, list) or not values:
+            return Response(
+                {"error": f"El parámetro '{field}s' debe ser una lista no vacía."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(values) > settings.BATCH_GET_MAX_ITEMS:
+            return Response(
+                {"error": f"Se permiten como máximo {settings.BATCH_GET_MAX_ITEMS} elementos por petición."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if field == 'id':
+            # int() también aceptaría 1.7 o true; solo se admiten enteros o cadenas de dígitos
+            if not all(
+                (isinstance(value, int) and not isinstance(value, bool))
+                or (isinstance(value, str) and value.strip().isascii() and value.strip().isdigit())
+                for value in values
+            ):
+                return Response(
+                    {"error": "El parámetro 'ids' debe contener números enteros."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            values = [int(value) for value in values]
+            found = BookCacheService.get_many(set(values))
+        else:
+            values = [str(value).strip() for value in values]
+            found = BookCacheService.get_many_by_isbn(set(values))
+        
+        # Una consulta IN por lote para lo que no estaba en caché
+        missing = list({value for value in values if value not in found})
+        chunk_size = settings.BATCH_GET_CHUNK_SIZE
+        for start in range(0, len(missing), chunk_size):
+            books = self.get_queryset().order_by().filter(
+                **{f'{field}__in': missing[start:start + chunk_size]}
+            )
+            books_data = self.get_serializer(books, many=True).data
+            BookCacheService.set_many(books_data)
+            found.update({data[field]: data for data in books_data})
+        
+        results = [
+            found.get(value, {field: value, 'found': False})
+            for value in values
+        ]
+        return Response(
+            {
+                'results': results,
+                'not_found': [value for value in values if value not in found],
+            },
+            status=status.HTTP_200_OK
+        )
+    
     @action(detail=True, methods=['post'], url_path='calculate-price')
     def calculate_price(self, request, pk=None):
         """
@@ -86,7 +191,7 @@ class BookViewSet(viewsets.ModelViewSet):
         Calcula el precio de venta sugerido basado en tasas de cambio.
         
         Query params opcionales:
-        - currency: Código de moneda (default: basado en supplier_country)
+        - currency: Código de moneda (default: la moneda del proveedor)
         """
         try:
             book = self.get_object()
@@ -100,7 +205,7 @@ class BookViewSet(viewsets.ModelViewSet):
             # Calcular precio
             calculation = PriceCalculatorService.calculate_selling_price(
                 cost_usd=book.cost_usd,
-                country_code=book.supplier_country
+                currency=book.supplier.currency
             )
             
             # Actualizar el libro con el nuevo precio
@@ -129,4 +234,16 @@ class BookViewSet(viewsets.ModelViewSet):
             return Response(
                 {"error": f"Error al calcular precio: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+@api_view(['GET'])
+def repricing_queue_status(request):
+    """
+    GET /repricing/queue/
+    Profundidad y retraso de la cola de reprecio.
+    """
+    stats = RepricingService.queue_stats()
+    if stats['oldest_pending_at'] is not None:
+        stats['oldest_pending_at'] = stats['oldest_pending_at'].isoformat()
+    return Response(stats, status=status.HTTP_200_OK)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+from decimal import Decimal
 from pathlib import Path
 from decouple import config
 
@@ -39,6 +40,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'books'
 ]
@@ -133,6 +135,36 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Exchange Rate API
+# Se puede apuntar a un stub local (ver `exchange_rate_stub`) para pruebas de carga
+EXCHANGE_RATE_API_URL = config(
+    'EXCHANGE_RATE_API_URL', default='https://api.exchangerate-api.com/v4/latest/USD'
+)
+
+# Repricing Configuration
+# Variación relativa mínima de una tasa de cambio para encolar un reprecio (0.01 = 1%)
+REPRICING_RATE_THRESHOLD = config('REPRICING_RATE_THRESHOLD', default='0.01', cast=Decimal)
+REPRICING_CHUNK_SIZE = config('REPRICING_CHUNK_SIZE', default=5000, cast=int)
+REPRICING_POLL_INTERVAL = config('REPRICING_POLL_INTERVAL', default=300, cast=int)  # segundos
+REPRICING_STALE_AFTER = config('REPRICING_STALE_AFTER', default=600, cast=int)  # segundos
+
+# Facets Configuration
+FACETS_CACHE_TIMEOUT = config('FACETS_CACHE_TIMEOUT', default=60, cast=int)  # segundos
+
+# Cache
+# Local por proceso por defecto; la caché de libros de batch-get requiere una compartida
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Batch Get Configuration
+BATCH_GET_MAX_ITEMS = config('BATCH_GET_MAX_ITEMS', default=1000, cast=int)
+BATCH_GET_CHUNK_SIZE = config('BATCH_GET_CHUNK_SIZE', default=500, cast=int)  # valores por consulta IN
+BOOK_CACHE_TIMEOUT = config('BOOK_CACHE_TIMEOUT', default=0, cast=int)  # segundos; 0 la desactiva
+
 # Logging Configuration
 LOGGING = {
     'version': 1,